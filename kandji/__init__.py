@@ -1,3 +1,26 @@
-from .kandji import Kandji
+# Submodules are imported on first attribute access so that `import kandji`
+# (and the `kandji` command line tool) does not pay for `requests` up front.
+_exports = {
+    "Kandji": ".kandji",
+    "KandjiError": ".kandji",
+    "KandjiPool": ".pool",
+    "RateLimiter": ".pool",
+    "DeadlineExceeded": ".timeouts",
+    "deadline": ".timeouts",
+}
 
-__version__ = Kandji.version
+__all__ = [*_exports, "__version__"]
+
+
+def __getattr__(name):
+    import importlib
+
+    if name == "__version__":
+        return __getattr__("Kandji").version
+
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,86 @@
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_DONE = object()
+
+
+def fan_out(fn, items, max_workers=8):
+    """Call `fn(item)` for every item concurrently.
+
+    Each call runs in a copy of the caller's context, so an enclosing `deadline` applies
+    to the workers too. When a call fails, or the consumer stops early, calls that have
+    not started yet are cancelled.
+
+    Yields:
+        tuple: `(item, result)` pairs in completion order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(contextvars.copy_context().run, fn, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def merge_iterators(iterators, max_buffered=1000):
+    """Consume several iterators concurrently and merge their records into one stream.
+
+    Each iterator is consumed in a copy of the caller's context, so an enclosing
+    `deadline` applies to it too.
+
+    Args:
+        iterators (dict): Mapping of tag to iterator (or zero-argument callable returning one).
+        max_buffered (int, optional): Maximum number of records buffered ahead of the consumer.
+
+    Yields:
+        tuple: `(tag, record)` pairs in arrival order.
+    """
+    if not iterators:
+        return
+
+    records = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up once the consumer is gone, so a full queue cannot block the producer forever
+        while not stop.is_set():
+            try:
+                records.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(tag, iterator):
+        try:
+            for record in iterator() if callable(iterator) else iterator:
+                if not put((tag, record, None)):
+                    return
+        except Exception as exc:
+            put((tag, _DONE, exc))
+            return
+        put((tag, _DONE, None))
+
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(produce, tag, iterator), daemon=True)
+        for tag, iterator in iterators.items()
+    ]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(threads)
+    try:
+        while remaining:
+            tag, record, exc = records.get()
+            if record is _DONE:
+                if exc is not None:
+                    raise exc
+                remaining -= 1
+                continue
+            yield tag, record
+    finally:
+        stop.set()
@@ -0,0 +1,138 @@
+import heapq
+import time
+
+from ._concurrency import fan_out
+
+
+def _position(entry):
+    return entry.get("created_at") or "", entry.get("id") or 0
+
+
+class ActivityTailer:
+    """Incrementally tail device activity across a Kandji tenant.
+
+    Every poll lists devices ordered by `-last_check_in` and stops paging at the first
+    device that has not checked in since the previous poll. Only those devices are
+    polled, and only activity newer than each device's high-water mark is fetched.
+
+    Attributes:
+        client (Kandji): Client to poll.
+        state (dict, optional): State of a previous tailer, see `state`.
+        backfill (bool, optional): Emit the existing activity history on the first poll of a
+            device instead of only recording its high-water mark. Defaults to False.
+        page_size (int, optional): Activity entries requested per page. Defaults to 50.
+        max_workers (int, optional): Concurrent activity requests. Defaults to 8.
+    """
+
+    def __init__(self, client, state: dict = None, backfill: bool = False, page_size: int = 50, max_workers: int = 8):
+        self.client = client
+        self.backfill = backfill
+        self.page_size = page_size
+        self.max_workers = max_workers
+        state = state or {}
+        self._since = state.get("since")
+        self._retry = set(state.get("retry", ()))
+        self._cursors = {device_id: tuple(cursor) for device_id, cursor in state.get("cursors", {}).items()}
+
+    @property
+    def state(self):
+        """JSON serializable state to resume tailing with, e.g. after a restart.
+
+        Returns:
+            dict
+        """
+        return {
+            "since": self._since,
+            "retry": sorted(self._retry),
+            "cursors": {device_id: list(cursor) for device_id, cursor in self._cursors.items()},
+        }
+
+    def _checked_in_devices(self):
+        since = self._since
+        device_ids = []
+        latest = since
+
+        for device in self.client.iter_devices(ordering="-last_check_in"):
+            last_check_in = device.get("last_check_in")
+            if since is not None and (last_check_in is None or last_check_in <= since):
+                break
+            if last_check_in is not None and (latest is None or last_check_in > latest):
+                latest = last_check_in
+            device_ids.append(device["device_id"])
+
+        return device_ids, latest
+
+    def _fetch(self, device_id):
+        cursor = self._cursors.get(device_id)
+        # Without backfill, a new device only needs its latest entry as the high-water mark
+        latest_only = cursor is None and not self.backfill
+        limit = 1 if latest_only else self.page_size
+        entries = []
+        offset = 0
+
+        while True:
+            page = self.client.get_device_activity(device_id, limit=limit, offset=offset)
+            if "activity" not in page:
+                return None
+
+            results = page["activity"]["results"]
+            new = [entry for entry in results if cursor is None or _position(entry) > cursor]
+            entries.extend(new)
+
+            if len(new) < len(results) or not page["activity"].get("next") or latest_only:
+                break
+            offset += len(results)
+
+        return sorted(entries, key=_position)
+
+    def poll(self, all_devices: bool = False):
+        """Fetch new activity of the devices that checked in since the previous poll.
+
+        High-water marks advance as events are consumed. If the stream is not consumed to
+        the end, the same devices are polled again next time, so no events are lost.
+        Devices whose activity request failed are retried on the next poll.
+
+        Args:
+            all_devices (bool, optional): Poll every known device, not just the ones that
+                checked in since the previous poll. Defaults to False.
+
+        Yields:
+            tuple: `(device_id, activity entry)` pairs, ordered by `created_at`.
+        """
+        device_ids, latest = self._checked_in_devices()
+        device_ids += sorted(self._retry)
+        if all_devices:
+            device_ids += list(self._cursors)
+        device_ids = list(dict.fromkeys(device_ids))
+        retry = set()
+
+        streams = []
+        for device_id, entries in fan_out(self._fetch, device_ids, max_workers=self.max_workers):
+            if entries is None:
+                retry.add(device_id)
+                continue
+
+            if device_id not in self._cursors and not self.backfill:
+                # First sight of the device, only record where its history ends
+                self._cursors[device_id] = _position(entries[-1]) if entries else ("", 0)
+                continue
+
+            streams.append([(_position(entry), device_id, entry) for entry in entries])
+
+        for position, device_id, entry in heapq.merge(*streams, key=lambda event: event[0]):
+            yield device_id, entry
+            self._cursors[device_id] = position
+
+        self._since = latest
+        self._retry = retry
+
+    def tail(self, interval: float = 60):
+        """Poll forever, sleeping `interval` seconds between polls.
+
+        Yields:
+            tuple: `(device_id, activity entry)` pairs, ordered by `created_at` within each poll.
+        """
+        while True:
+            started = time.monotonic()
+            yield from self.poll()
+            time.sleep(max(0, interval - (time.monotonic() - started)))
@@ -0,0 +1,137 @@
+"""Command line interface streaming Kandji API results as NDJSON.
+
+Usage:
+    kandji devices list [--platform Mac] | jq .serial_number
+    kandji devices apps DEVICE_ID
+    kandji blueprints list
+    kandji ade devices ADE_TOKEN_ID
+    kandji custom-apps list
+
+The API URL and token are read from `--api-url`/`--api-token` or the
+`KANDJI_API_URL`/`KANDJI_API_TOKEN` environment variables.
+"""
+
+import argparse
+import os
+import sys
+
+DEVICE_SUBRESOURCES = {
+    "get": "get_device",
+    "details": "get_device_details",
+    "activity": "get_device_activity",
+    "apps": "get_device_apps",
+    "library-items": "get_device_libraryitems",
+    "parameters": "get_device_parameters",
+    "status": "get_device_status",
+    "notes": "list_device_notes",
+    "commands": "get_device_commands",
+}
+
+DEVICE_FILTERS = (
+    "asset_tag",
+    "blueprint_id",
+    "device_name",
+    "mac_address",
+    "model",
+    "ordering",
+    "os_version",
+    "platform",
+    "serial_number",
+    "user",
+    "user_email",
+    "user_id",
+    "user_name",
+)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="kandji", description="Stream Kandji API results as NDJSON.")
+    parser.add_argument("--api-url", default=os.environ.get("KANDJI_API_URL"), help="defaults to $KANDJI_API_URL")
+    parser.add_argument("--api-token", default=os.environ.get("KANDJI_API_TOKEN"), help="defaults to $KANDJI_API_TOKEN")
+    resources = parser.add_subparsers(dest="resource", required=True)
+
+    devices = resources.add_parser("devices").add_subparsers(dest="action", required=True)
+    devices_list = devices.add_parser("list", help="list all devices")
+    devices_list.add_argument("--limit", type=int, default=300, help="page size")
+    for name in DEVICE_FILTERS:
+        devices_list.add_argument(f"--{name.replace('_', '-')}", dest=name)
+    for action in DEVICE_SUBRESOURCES:
+        devices.add_parser(action, help=f"device {action}").add_argument("device_id")
+
+    blueprints = resources.add_parser("blueprints").add_subparsers(dest="action", required=True)
+    blueprints.add_parser("list", help="list all blueprints").add_argument("--name")
+
+    ade = resources.add_parser("ade").add_subparsers(dest="action", required=True)
+    ade.add_parser("devices", help="list devices associated to an ADE token").add_argument("ade_token_id")
+
+    custom_apps = resources.add_parser("custom-apps").add_subparsers(dest="action", required=True)
+    custom_apps.add_parser("list", help="list all custom apps")
+
+    return parser
+
+
+def _records(client, args):
+    if args.resource == "devices" and args.action == "list":
+        filters = {name: getattr(args, name) for name in DEVICE_FILTERS if getattr(args, name) is not None}
+        return client.iter_devices(limit=args.limit, **filters)
+
+    if args.resource == "blueprints":
+        return client.iter_blueprints(name=args.name)
+
+    if args.resource == "ade":
+        return client.iter_ade_devices(args.ade_token_id)
+
+    return client.iter_custom_apps()
+
+
+def main(argv=None, transport=None):
+    """Run the command line interface.
+
+    Args:
+        argv (list, optional): Arguments, defaults to `sys.argv[1:]`.
+        transport (object, optional): Transport for the client, see `Kandji`.
+
+    Returns:
+        int: Exit status.
+    """
+    args = _parser().parse_args(argv)
+
+    if not args.api_url or not args.api_token:
+        print(
+            "kandji: --api-url and --api-token (or KANDJI_API_URL and KANDJI_API_TOKEN) are required",
+            file=sys.stderr,
+        )
+        return 2
+
+    from .kandji import Kandji, KandjiError
+
+    client = Kandji(args.api_url, args.api_token, transport=transport)
+    out = sys.stdout.buffer
+
+    try:
+        if args.resource == "devices" and args.action in DEVICE_SUBRESOURCES:
+            # Single responses are passed through without being decoded
+            res = getattr(client.raw(out=out), DEVICE_SUBRESOURCES[args.action])(args.device_id)
+            if isinstance(res, dict):
+                print(f"kandji: request failed with status {res['response']['status']}", file=sys.stderr)
+                return 1
+            out.write(b"\n")
+        else:
+            dumps = client.json_codec.dumps
+            for record in _records(client, args):
+                out.write(dumps(record))
+                out.write(b"\n")
+        out.flush()
+    except KandjiError as exc:
+        print(f"kandji: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`), silence the error on interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import json
+
+
+class StdlibCodec:
+    """JSON codec backed by the standard library `json` module."""
+
+    name = "json"
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec:
+    """JSON codec backed by `orjson`."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.loads = orjson.loads
+        self.dumps = orjson.dumps
+
+
+class MsgspecCodec:
+    """JSON codec backed by `msgspec`."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self.loads = msgspec.json.decode
+        self.dumps = msgspec.json.encode
+
+
+def default_codec():
+    """Return the fastest available JSON codec.
+
+    `orjson` is preferred, then `msgspec`, falling back to the standard library.
+
+    Returns:
+        object with `loads(bytes)` and `dumps(obj) -> bytes`
+    """
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec()
+        except ImportError:
+            continue
+
+    return StdlibCodec()
@@ -0,0 +1,248 @@
+import hashlib
+import os
+import shutil
+from typing import Any, NamedTuple
+
+from ._concurrency import fan_out
+from .codecs import default_codec
+
+DEVICE_FIELDS = {
+    "os_version": "os_version_changed",
+    "blueprint_id": "blueprint_changed",
+    "device_name": "device_renamed",
+    "user": "user_changed",
+}
+
+
+class Change(NamedTuple):
+    """A single drift event between two snapshots.
+
+    Attributes:
+        kind (str): Event type, e.g. `device_added`, `os_version_changed`, `app_added`,
+            `app_removed`, `app_version_changed` or `<subresource>_changed`.
+        device_id (str): Device ID.
+        key (str): What changed: the device field, app bundle ID or subresource name.
+        old (Any): Previous value, `None` for additions.
+        new (Any): New value, `None` for removals.
+    """
+
+    kind: str
+    device_id: str
+    key: str = None
+    old: Any = None
+    new: Any = None
+
+
+def _hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class _BlobDir:
+    # Lazily reads content-addressed blobs from a snapshot directory
+    def __init__(self, path):
+        self.path = path
+
+    def __getitem__(self, digest):
+        with open(os.path.join(self.path, digest), "rb") as f:
+            return f.read()
+
+    def copy(self, digest, target):
+        source = os.path.join(self.path, digest)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+    def __contains__(self, digest):
+        return os.path.exists(os.path.join(self.path, digest))
+
+
+class Snapshot:
+    """Per-device content hashes of the device list and device subresources.
+
+    Subresource bodies are kept undecoded and content-addressed by their hash, so
+    comparing two snapshots only decodes the devices whose hashes changed.
+
+    Attributes:
+        devices (dict): Device ID to device record, as returned by `list_devices`.
+        hashes (dict): Device ID to a dict of `{"device" | subresource: hash}`.
+        blobs (dict): Hash to the undecoded subresource body, for the bodies fetched by
+            this snapshot. Bodies reused from `base` are only referenced by hash.
+        base (Snapshot, optional): Earlier snapshot holding the reused bodies.
+    """
+
+    def __init__(self, devices: dict = None, hashes: dict = None, blobs=None, base=None):
+        self.devices = devices or {}
+        self.hashes = hashes or {}
+        self.blobs = blobs if blobs is not None else {}
+        self.base = base
+
+    def _owner(self, digest):
+        snapshot = self
+        while snapshot is not None:
+            if digest in snapshot.blobs:
+                return snapshot
+            snapshot = snapshot.base
+        raise KeyError(digest)
+
+    def blob(self, digest: str):
+        """Return the undecoded subresource body with the given hash.
+
+        Args:
+            digest (str): Content hash.
+
+        Returns:
+            bytes
+        """
+        return self._owner(digest).blobs[digest]
+
+    @classmethod
+    def capture(cls, client, subresources: tuple = ("apps",), previous=None, max_workers: int = 8):
+        """Capture a snapshot of all devices.
+
+        Args:
+            client (Kandji): Client to capture from.
+            subresources (tuple, optional): Device subresources to hash, any `get_device_<name>`
+                method can be used. Defaults to `("apps",)`.
+            previous (Snapshot, optional): Earlier snapshot. Subresources of devices that have
+                not checked in since are reused instead of being fetched again.
+            max_workers (int, optional): Concurrent subresource requests. Defaults to 8.
+
+        Returns:
+            Snapshot
+        """
+        dumps = client.json_codec.dumps
+        snapshot = cls(base=previous)
+        pending = []
+
+        for device in client.iter_devices():
+            device_id = device["device_id"]
+            snapshot.devices[device_id] = device
+            hashes = snapshot.hashes[device_id] = {"device": _hash(dumps(device))}
+
+            old_device = previous.devices.get(device_id) if previous else None
+            unchanged = old_device is not None and old_device.get("last_check_in") == device.get("last_check_in")
+
+            for name in subresources:
+                digest = previous.hashes[device_id].get(name) if unchanged else None
+                if digest is None:
+                    pending.append((device_id, name))
+                    continue
+                hashes[name] = digest
+
+        raw = client.raw()
+        fetched = fan_out(lambda key: getattr(raw, f"get_device_{key[1]}")(key[0]), pending, max_workers=max_workers)
+        for (device_id, name), body in fetched:
+            if isinstance(body, dict):
+                # Failed request, the subresource is left out of the comparison
+                continue
+            digest = _hash(body)
+            snapshot.hashes[device_id][name] = digest
+            snapshot.blobs[digest] = body
+
+        return snapshot
+
+    def save(self, path: str):
+        """Save the snapshot to a directory.
+
+        Bodies reused from a saved `base` snapshot are hard-linked (or copied, across file
+        systems) into the new directory rather than read into memory. Afterwards the
+        snapshot reads its bodies from the directory and drops its in-memory copies.
+
+        Args:
+            path (str): Directory, created if missing.
+        """
+        blob_dir = os.path.join(path, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+
+        for device_hashes in self.hashes.values():
+            for name, digest in device_hashes.items():
+                blob_path = os.path.join(blob_dir, digest)
+                if name == "device" or os.path.exists(blob_path):
+                    continue
+                blobs = self._owner(digest).blobs
+                if isinstance(blobs, _BlobDir):
+                    blobs.copy(digest, blob_path)
+                    continue
+                with open(blob_path, "wb") as f:
+                    f.write(blobs[digest])
+
+        with open(os.path.join(path, "snapshot.json"), "wb") as f:
+            f.write(default_codec().dumps({"devices": self.devices, "hashes": self.hashes}))
+
+        self.blobs = _BlobDir(blob_dir)
+        self.base = None
+
+    @classmethod
+    def load(cls, path: str):
+        """Load a snapshot saved with `save`. Subresource bodies are read on demand.
+
+        Args:
+            path (str): Snapshot directory.
+
+        Returns:
+            Snapshot
+        """
+        with open(os.path.join(path, "snapshot.json"), "rb") as f:
+            data = default_codec().loads(f.read())
+
+        return cls(data["devices"], data["hashes"], _BlobDir(os.path.join(path, "blobs")))
+
+
+def _diff_apps(device_id, old, new):
+    old_apps = {app.get("bundle_id") or app.get("app_name"): app for app in old.get("apps", [])}
+    new_apps = {app.get("bundle_id") or app.get("app_name"): app for app in new.get("apps", [])}
+
+    for key in sorted(old_apps.keys() - new_apps.keys(), key=str):
+        yield Change("app_removed", device_id, key, old_apps[key], None)
+
+    for key in sorted(new_apps.keys() - old_apps.keys(), key=str):
+        yield Change("app_added", device_id, key, None, new_apps[key])
+
+    for key in sorted(old_apps.keys() & new_apps.keys(), key=str):
+        old_version, new_version = old_apps[key].get("version"), new_apps[key].get("version")
+        if old_version != new_version:
+            yield Change("app_version_changed", device_id, key, old_version, new_version)
+
+
+def diff(old: Snapshot, new: Snapshot, json_codec=None):
+    """Compare two snapshots.
+
+    Only devices and subresources whose hashes differ are decoded and compared.
+
+    Args:
+        old (Snapshot): Earlier snapshot.
+        new (Snapshot): Later snapshot.
+        json_codec (object, optional): Codec used to decode subresource bodies.
+
+    Yields:
+        Change
+    """
+    loads = (json_codec or default_codec()).loads
+
+    for device_id in sorted(old.hashes.keys() | new.hashes.keys()):
+        if device_id not in new.hashes:
+            yield Change("device_removed", device_id, old=old.devices[device_id])
+            continue
+
+        if device_id not in old.hashes:
+            yield Change("device_added", device_id, new=new.devices[device_id])
+            continue
+
+        old_hashes, new_hashes = old.hashes[device_id], new.hashes[device_id]
+
+        for name, new_digest in new_hashes.items():
+            old_digest = old_hashes.get(name)
+            if old_digest is None or old_digest == new_digest:
+                continue
+
+            if name == "device":
+                old_device, new_device = old.devices[device_id], new.devices[device_id]
+                for field, kind in DEVICE_FIELDS.items():
+                    if old_device.get(field) != new_device.get(field):
+                        yield Change(kind, device_id, field, old_device.get(field), new_device.get(field))
+            elif name == "apps":
+                yield from _diff_apps(device_id, loads(old.blob(old_digest)), loads(new.blob(new_digest)))
+            else:
+                old_body, new_body = loads(old.blob(old_digest)), loads(new.blob(new_digest))
+                yield Change(f"{name}_changed", device_id, name, old_body, new_body)
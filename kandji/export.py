@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import timeouts
+from ._concurrency import fan_out
+from .codecs import default_codec
+from .kandji import Kandji
+
+
+def _export_shard(budget, *args):
+    if budget is None:
+        return _write_shard(*args)
+
+    with timeouts.deadline(budget):
+        return _write_shard(*args)
+
+
+def _write_shard(
+    api_url, api_token, transport_factory, path, shard, shards, limit, subresources, filters, transform, detail_workers
+):
+    client = Kandji(api_url, api_token, transport=transport_factory() if transport_factory else None)
+    dumps = client.json_codec.dumps
+    fetchers = {name: getattr(client, f"get_device_{name}") for name in subresources}
+    offset = shard * limit
+    pages = []
+    failed = []
+
+    with open(path, "wb") as f:
+        while True:
+            devices = client._page_records(client.list_devices(limit=limit, offset=offset, **filters))
+
+            if fetchers:
+                details = dict(
+                    fan_out(
+                        lambda key: fetchers[key[1]](key[0]),
+                        [(device["device_id"], name) for device in devices for name in fetchers],
+                        max_workers=detail_workers,
+                    )
+                )
+                for device in devices:
+                    for name in fetchers:
+                        detail = details[(device["device_id"], name)]
+                        if isinstance(detail, dict) and "response" in detail:
+                            # Failed request, leave the subresource out and report it in the manifest
+                            failed.append([device["device_id"], name])
+                            continue
+                        device[name] = detail
+
+            count = 0
+            for device in devices:
+                record = transform(device) if transform else device
+                if record is not None:
+                    f.write(dumps(record))
+                    f.write(b"\n")
+                    count += 1
+            pages.append(count)
+
+            if len(devices) < limit:
+                break
+
+            offset += shards * limit
+
+    return {"shard": shard, "path": path, "records": sum(pages), "pages": pages, "failed": failed}
+
+
+def _merge_shards(results, path):
+    # Shard `n` holds pages n, n + shards, ..., so taking one page from each shard in
+    # turn restores the `list_devices` order
+    files = [open(result["path"], "rb") for result in results]
+    try:
+        with open(path, "wb") as out:
+            page = 0
+            while True:
+                shard, index = page % len(results), page // len(results)
+                if index >= len(results[shard]["pages"]):
+                    break
+                for _ in range(results[shard]["pages"][index]):
+                    out.write(files[shard].readline())
+                page += 1
+    finally:
+        for f in files:
+            f.close()
+
+
+def export_devices(
+    api_url: str,
+    api_token: str,
+    out_dir: str,
+    shards: int = None,
+    subresources: tuple = (),
+    limit: int = 300,
+    filters: dict = None,
+    transform=None,
+    detail_workers: int = 8,
+    merge: bool = False,
+    transport_factory=None,
+):
+    """Export all devices to NDJSON shards using a pool of worker processes.
+
+    The `list_devices` offset space is split between the shards: shard `n` reads pages
+    `n`, `n + shards`, `n + 2 * shards`, ... Each worker process runs its own client,
+    fetches the requested per-device subresources concurrently and writes its own shard.
+
+    Args:
+        api_url (str): Your organization’s API URL.
+        api_token (str): API token.
+        out_dir (str): Directory the shards and `manifest.json` are written to.
+        shards (int, optional): Number of shards and worker processes. Defaults to the number of CPUs.
+        subresources (tuple, optional): Per-device subresources to embed in each record,
+            e.g. `("details", "apps")`. Any `get_device_<name>` method can be used.
+        limit (int, optional): Number of devices requested per page. Defaults to 300.
+        filters (dict, optional): `list_devices` filter arguments. Ordering defaults to
+            `device_id` so the pages are stable while the shards read them.
+        transform (callable, optional): Module-level function applied to each record in the
+            worker. Records it maps to `None` are dropped.
+        detail_workers (int, optional): Concurrent subresource requests per worker. Defaults to 8.
+        merge (bool, optional): Also merge the shards into `devices.ndjson`, in `list_devices` order.
+            Defaults to False.
+        transport_factory (callable, optional): Picklable zero-argument callable that every worker
+            calls to create its client's transport, e.g.
+            `functools.partial(kandji.transport.ReplayTransport, "traffic.jsonl.gz")`.
+
+    Returns:
+        dict: The manifest, listing every shard with its path, record count and records per page.
+            Subresources whose request failed are left out of their record and listed as
+            `[device_id, subresource]` pairs under `failed`.
+
+    Raises:
+        KandjiError: If a `list_devices` page request fails.
+        kandji.timeouts.DeadlineExceeded: If the remaining budget of an enclosing `deadline`,
+            which is handed to every worker, runs out.
+    """
+    shards = shards or os.cpu_count() or 1
+    filters = {"ordering": "device_id", **(filters or {})}
+    os.makedirs(out_dir, exist_ok=True)
+    budget = timeouts.check()
+
+    with ProcessPoolExecutor(max_workers=shards) as executor:
+        futures = [
+            executor.submit(
+                _export_shard,
+                budget,
+                api_url,
+                api_token,
+                transport_factory,
+                os.path.join(out_dir, f"devices-{shard:04d}.ndjson"),
+                shard,
+                shards,
+                limit,
+                tuple(subresources),
+                filters,
+                transform,
+                detail_workers,
+            )
+            for shard in range(shards)
+        ]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    manifest = {
+        "shards": results,
+        "records": sum(result["records"] for result in results),
+        "subresources": list(subresources),
+        "failed": [pair for result in results for pair in result["failed"]],
+    }
+
+    if merge:
+        merged = os.path.join(out_dir, "devices.ndjson")
+        _merge_shards(results, merged)
+        manifest["merged"] = merged
+
+    with open(os.path.join(out_dir, "manifest.json"), "wb") as f:
+        f.write(default_codec().dumps(manifest))
+
+    return manifest
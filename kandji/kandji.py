@@ -1,9 +1,36 @@
 # Liberated from https://github.com/frefrik/python-kandji/
 
+import copy
 import importlib.metadata
-import json
 
-import requests
+from . import timeouts
+from .codecs import default_codec
+
+# Seconds to wait for a connection and between bytes of a response
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class KandjiError(Exception):
+    """Raised by the paginated iterators when a page request fails.
+
+    Attributes:
+        status (int): HTTP status code of the failed request.
+    """
+
+    def __init__(self, status):
+        # Only the status goes into `args`, so the error survives pickling, e.g. from export workers
+        super().__init__(status)
+        self.status = status
+
+    def __str__(self):
+        return f"Kandji API request failed with status {self.status}"
+
+
+class _Version:
+    # Resolved on first access, the metadata lookup is slow enough to matter at import time
+    def __get__(self, instance, owner):
+        owner.version = importlib.metadata.version("kandji")
+        return owner.version
 
 
 class Kandji:
@@ -14,42 +41,186 @@ class Kandji:
             EU Region: `https://SubDomain.clients.eu.kandji.io`
             US Region: `https://SubDomain.clients.us-1.kandji.io`
         api_token (str): API token.
+        json_codec (object, optional): JSON codec used to encode request bodies and decode
+            responses. Any object with `loads(bytes)` and `dumps(obj) -> bytes` will do.
+            Defaults to `orjson` or `msgspec` when installed, otherwise the standard library.
+        transport (object, optional): Transport used to send requests: anything with a
+            `requests.Session.request` compatible `request(method, url, **kwargs)` method.
+            Defaults to a new `requests.Session`. Pass a shared session to reuse connection
+            pools between clients, or a `kandji.transport.RecordingTransport` or
+            `kandji.transport.ReplayTransport` to record and replay API traffic.
+        rate_limiter (kandji.pool.RateLimiter, optional): Limiter acquired before every request.
+        timeout (float | tuple, optional): Request timeout in seconds, or a `(connect, read)` tuple.
+            The read timeout bounds the wait between bytes, not the whole response.
+            Defaults to `DEFAULT_TIMEOUT`, pass `None` to wait indefinitely. Requests inside a
+            `kandji.timeouts.deadline` block are additionally bounded by the remaining budget.
     """
 
-    version = importlib.metadata.version("kandji")
+    version = _Version()
 
-    def __init__(self, api_url, api_token):
+    def __init__(self, api_url, api_token, json_codec=None, transport=None, rate_limiter=None, timeout=DEFAULT_TIMEOUT):
         self.api_url = f"{api_url}/api/v1"
+        self.json_codec = json_codec or default_codec()
+        if transport is None:
+            import requests
+
+            transport = requests.Session()
+
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
         self.headers = {
             "User-Agent": f"python-kandji/{self.version}",
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json",
         }
+        self._raw = False
+        self._raw_out = None
+        self._raw_view = False
+        self._raw_chunk_size = 65536
+
+    def raw(self, out=None, view: bool = False, chunk_size: int = 65536):
+        """Return a copy of the client whose GET methods skip JSON decoding.
+
+        Useful for pass-through pipelines that forward responses to object storage
+        or a message bus. Non-GET methods and error responses are unaffected.
+
+        Args:
+            out (object, optional): Writable (anything with a `write` method) that the
+                response body is streamed into in `chunk_size` chunks.
+                The GET methods then return the number of bytes written.
+            view (bool, optional): Return a `memoryview` of the body instead of `bytes`.
+                Ignored when `out` is given. Defaults to False.
+            chunk_size (int, optional): Chunk size used when streaming into `out`. Defaults to 65536.
+
+        Returns:
+            Kandji
+        """
+        client = copy.copy(self)
+        client._raw = True
+        client._raw_out = out
+        client._raw_view = view
+        client._raw_chunk_size = chunk_size
+        return client
+
+    def with_timeout(self, timeout):
+        """Return a copy of the client using a different request timeout.
+
+        Args:
+            timeout (float | tuple): Timeout in seconds, or a `(connect, read)` tuple.
+
+        Returns:
+            Kandji
+        """
+        client = copy.copy(self)
+        client.timeout = timeout
+        return client
 
     def _request(self, method, path, **kwargs):
         uri = "{}{}".format(self.api_url, path)
         headers = kwargs.get("headers", self.headers)
         params = self._format_params(kwargs.get("params", {}))
-        payload = kwargs.get("json", {})
+        payload = self.json_codec.dumps(kwargs.get("json", {}))
+        raw = self._raw and method == "get"
+
+        timeouts.check()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        left = timeouts.check()
+        try:
+            # Under a deadline the body is streamed, so the budget is checked between chunks
+            # instead of only bounding each socket read
+            response = self.transport.request(
+                method,
+                uri,
+                headers=headers,
+                params=params,
+                data=payload,
+                stream=left is not None or (raw and self._raw_out is not None),
+                timeout=timeouts.cap(kwargs.get("timeout", self.timeout), left),
+            )
+
+            if response.status_code not in [200, 201]:
+                response.close()
+                return {"response": {"status": response.status_code}}
+
+            if raw and self._raw_out is not None:
+                return self._write_raw(response)
+
+            content = self._read_body(response)
+        except Exception as exc:
+            if left is not None and timeouts.remaining() <= 0:
+                raise timeouts.DeadlineExceeded("Kandji deadline exceeded") from exc
+            raise
+
+        if raw:
+            return memoryview(content) if self._raw_view else content
 
-        response = getattr(requests, method)(
-            uri,
-            headers=headers,
-            params=params,
-            json=payload,
-        )
+        if response.headers["Content-Type"] == "application/x-x509-ca-cert":
+            return content.decode(response.encoding or "utf-8")
 
-        if response.status_code not in [200, 201]:
-            return {"response": {"status": response.status_code}}
+        return self.json_codec.loads(content)
 
-        if response.headers["Content-Type"] == "application/x-x509-ca-cert":
-            return response.text
+    def _iter_body(self, response):
+        for chunk in response.iter_content(chunk_size=self._raw_chunk_size):
+            timeouts.check()
+            yield chunk
 
-        return response.json()
+    def _read_body(self, response):
+        if timeouts.remaining() is None:
+            return response.content
+
+        with response:
+            return b"".join(self._iter_body(response))
+
+    def _write_raw(self, response):
+        written = 0
+        with response:
+            for chunk in self._iter_body(response):
+                self._raw_out.write(chunk)
+                written += len(chunk)
+
+        return written
 
     @staticmethod
     def _format_params(params):
-        return {k: json.dumps(v) if isinstance(v, bool) else v for k, v in params.items()}
+        return {k: ("true" if v else "false") if isinstance(v, bool) else v for k, v in params.items() if v is not None}
+
+    def _paginate_offset(self, list_method, limit, **kwargs):
+        offset = 0
+
+        while True:
+            page = list_method(limit=limit, offset=offset, **kwargs)
+            records = self._page_records(page)
+            yield from records
+
+            if len(records) < limit or (isinstance(page, dict) and not page.get("next")):
+                return
+
+            offset += len(records)
+
+    def _paginate_page(self, list_method, *args):
+        page_number = 1
+
+        while True:
+            page = list_method(*args, page=page_number)
+            yield from self._page_records(page)
+
+            if not page.get("next"):
+                return
+
+            page_number += 1
+
+    @staticmethod
+    def _page_records(page):
+        if isinstance(page, list):
+            return page
+
+        if "response" in page and "results" not in page:
+            raise KandjiError(page["response"]["status"])
+
+        return page["results"]
 
     def _get(self, path, **kwargs):
         return self._request("get", path, **kwargs)
@@ -217,6 +388,20 @@ class Kandji:
         }
         return self._get(f"/integrations/apple/ade/{ade_token_id}/devices", params=params)
 
+    def iter_ade_devices(self, ade_token_id: str):
+        """Iterate over all devices associated to an ADE token, following pagination.
+
+        Args:
+            ade_token_id (str): Automated Device Enrollment token ID
+
+        Yields:
+            dict
+
+        Raises:
+            KandjiError: If a page request fails.
+        """
+        return self._paginate_page(self.list_ade_devices, ade_token_id)
+
     def get_ade_integration(self, ade_token_id: str):
         """Get ADE integration.
 
@@ -276,6 +461,21 @@ class Kandji:
 
         return self._get("/blueprints", params=params)
 
+    def iter_blueprints(self, limit: int = 300, **filters):
+        """Iterate over all blueprint records in the Kandji instance, following pagination.
+
+        Args:
+            limit (int, optional): Number of results to request per page. Defaults to 300.
+            **filters: Any of the `list_blueprints` filter arguments.
+
+        Yields:
+            dict
+
+        Raises:
+            KandjiError: If a page request fails.
+        """
+        return self._paginate_offset(self.list_blueprints, limit, **filters)
+
     def get_blueprint(self, id: str):
         """This request returns information about a specific blueprint based on blueprint ID.
 
@@ -382,6 +582,21 @@ class Kandji:
 
         return self._get("/devices", params=params)
 
+    def iter_devices(self, limit: int = 300, **filters):
+        """Iterate over all devices in a Kandji tenant, following pagination.
+
+        Args:
+            limit (int, optional): Number of results to request per page. Defaults to 300.
+            **filters: Any of the `list_devices` filter arguments, e.g. `ordering` or `platform`.
+
+        Yields:
+            dict
+
+        Raises:
+            KandjiError: If a page request fails.
+        """
+        return self._paginate_offset(self.list_devices, limit, **filters)
+
     def get_device(self, id: str):
         """This request returns the high-level information for a specified Device ID.
 
@@ -404,16 +619,23 @@ class Kandji:
         """
         return self._get(f"/devices/{id}/details")
 
-    def get_device_activity(self, id: str):
+    def get_device_activity(self, id: str, limit: int = None, offset: int = None):
         """This request returns the device activity for a specified Device ID.
 
         Args:
             id (str): Device ID
+            limit (int, optional): Number of results to return per page.
+            offset (int, optional): The initial index from which to return the results.
 
         Returns:
             dict
         """
-        return self._get(f"/devices/{id}/activity")
+        params = {
+            "limit": limit,
+            "offset": offset,
+        }
+
+        return self._get(f"/devices/{id}/activity", params=params)
 
     def get_device_apps(self, id: str):
         """This request returns a list of all installed apps for a specified Device ID.
@@ -561,6 +783,17 @@ class Kandji:
 
         return self._get("/library/custom-apps", params=params)
 
+    def iter_custom_apps(self):
+        """Iterate over all custom apps in the Kandji library, following pagination.
+
+        Yields:
+            dict
+
+        Raises:
+            KandjiError: If a page request fails.
+        """
+        return self._paginate_page(self.list_custom_apps)
+
     def get_custom_app(self, library_item_id: str):
         """This endpoint retrieves details about a specific custom app from the Kandji library.
 
@@ -595,7 +828,13 @@ class Kandji:
             files = {"file": (file_location, f)}
 
             # Sending the POST request with multipart form data
-            response = requests.post(post_url, data=post_data, files=files)
+            response = self.transport.request(
+                "post",
+                post_url,
+                data=post_data,
+                files=files,
+                timeout=timeouts.cap(self.timeout, timeouts.check()),
+            )
 
         return response
 
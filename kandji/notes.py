@@ -0,0 +1,143 @@
+import re
+import zlib
+
+from ._concurrency import fan_out
+
+_TOKEN = re.compile(r"\w+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+class NotesIndex:
+    """In-memory full-text index over the device notes of a Kandji tenant.
+
+    Notes are fetched with `list_device_notes` for many devices concurrently and
+    indexed by word, with `(device_id, note_id)` postings and word positions for
+    phrase search.
+
+    The API has no fleet-wide signal for note changes (adding a note does not make a
+    device check in), so incremental refreshes sweep the fleet in `sweep_every` slices:
+    a note added to an already indexed device shows up after at most `sweep_every`
+    refreshes. Pass device IDs to `refresh` to pick up known changes immediately.
+
+    Attributes:
+        client (Kandji): Client used to fetch devices and notes.
+        max_workers (int, optional): Concurrent `list_device_notes` requests. Defaults to 8.
+        sweep_every (int, optional): Number of incremental refreshes it takes to refetch
+            every device once. Defaults to 24.
+    """
+
+    def __init__(self, client, max_workers: int = 8, sweep_every: int = 24):
+        if sweep_every < 1:
+            raise ValueError("sweep_every must be at least 1")
+
+        self.client = client
+        self.max_workers = max_workers
+        self.sweep_every = sweep_every
+        self.notes = {}
+        self._postings = {}
+        self._device_notes = {}
+        self._sweeps = 0
+
+    def refresh(self, device_ids: list = None):
+        """Fetch and (re-)index the notes of the given devices.
+
+        When no devices are given, all devices are listed and the devices that are new,
+        plus the next `1 / sweep_every` slice of the indexed devices, are fetched. Each device
+        stays in the slice picked by a hash of its ID. Devices that no longer exist are
+        dropped from the index.
+
+        Args:
+            device_ids (list, optional): Device IDs to refresh.
+
+        Returns:
+            int: Number of devices whose notes were fetched.
+        """
+        if device_ids is None:
+            devices = [device["device_id"] for device in self.client.iter_devices()]
+
+            for device_id in set(self._device_notes) - set(devices):
+                self._remove_device(device_id)
+
+            sweep = self._sweeps % self.sweep_every
+            self._sweeps += 1
+            # Slots come from the device ID, so devices joining or leaving do not shift the others
+            device_ids = [
+                device_id
+                for device_id in devices
+                if device_id not in self._device_notes or zlib.crc32(device_id.encode()) % self.sweep_every == sweep
+            ]
+
+        fetched = 0
+        for device_id, notes in fan_out(self.client.list_device_notes, device_ids, max_workers=self.max_workers):
+            if isinstance(notes, dict):
+                if "notes" not in notes:
+                    # Failed request, keep what is already indexed for the device
+                    continue
+                notes = notes["notes"]
+
+            self._remove_device(device_id)
+            self._device_notes[device_id] = set()
+            for note in notes:
+                self._add_note(device_id, note)
+            fetched += 1
+
+        return fetched
+
+    def _add_note(self, device_id, note):
+        key = (device_id, note["note_id"])
+        self.notes[key] = note
+        self._device_notes[device_id].add(key)
+
+        for position, token in enumerate(_tokenize(note.get("content") or "")):
+            self._postings.setdefault(token, {}).setdefault(key, []).append(position)
+
+    def _remove_device(self, device_id):
+        for key in self._device_notes.pop(device_id, ()):
+            note = self.notes.pop(key)
+            for token in set(_tokenize(note.get("content") or "")):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[token]
+
+    def search(self, query: str):
+        """Search the indexed notes.
+
+        All words and `"quoted phrases"` in the query must match. Terms containing
+        punctuation, such as ticket numbers like `INC-1234`, are matched as phrases.
+
+        Args:
+            query (str): Search query.
+
+        Returns:
+            list: `(device_id, note_id)` keys of the matching notes. Look up the notes in `notes`.
+        """
+        phrases = [_tokenize(phrase or word) for phrase, word in _QUERY.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        if not phrases:
+            return []
+
+        # Intersect starting from the rarest word to keep the candidate set small
+        words = sorted({word for phrase in phrases for word in phrase}, key=lambda w: len(self._postings.get(w, ())))
+        candidates = set(self._postings.get(words[0], ()))
+        for word in words[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(self._postings.get(word, ()))
+
+        return sorted(key for key in candidates if all(self._has_phrase(key, phrase) for phrase in phrases))
+
+    def _has_phrase(self, key, phrase):
+        if len(phrase) == 1:
+            return True
+
+        positions = [set(self._postings[word][key]) for word in phrase]
+        return any(
+            all(start + offset in positions[offset] for offset in range(1, len(phrase))) for start in positions[0]
+        )
@@ -0,0 +1,165 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ._concurrency import fan_out, merge_iterators
+from .kandji import Kandji
+
+
+class RateLimiter:
+    """Thread-safe token bucket rate limiter.
+
+    Attributes:
+        rate (float): Requests per second.
+        burst (int, optional): Maximum number of requests allowed in a burst. Defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class KandjiPool:
+    """Pool of `Kandji` clients for running requests across many tenants concurrently.
+
+    Unless a transport is given, clients in the same region share one `requests.Session`.
+    Every tenant has its own host, so urllib3 still keeps a connection pool per tenant; the
+    session's pool cache is sized to hold all of the region's tenants so that live pools are
+    never evicted. Every tenant gets its own rate limiter.
+
+    Attributes:
+        tenants (dict, optional): Mapping of tenant name to a dict with `api_url`, `api_token`
+            and optionally `rate_limit` (requests per second).
+        rate_limit (float, optional): Default requests per second per tenant. Defaults to 10.
+        max_workers (int, optional): Maximum number of tenants queried concurrently. Defaults to 16.
+        pool_maxsize (int, optional): Connections kept alive per host. Defaults to 10.
+        json_codec (object, optional): JSON codec shared by all clients.
+        transport (object, optional): Transport shared by all clients instead of the per-region
+            sessions, e.g. a `kandji.transport.ReplayTransport`.
+    """
+
+    def __init__(
+        self,
+        tenants: dict = None,
+        rate_limit: float = 10,
+        max_workers: int = 16,
+        pool_maxsize: int = 10,
+        json_codec=None,
+        transport=None,
+    ):
+        self.rate_limit = rate_limit
+        self.max_workers = max_workers
+        self.pool_maxsize = pool_maxsize
+        self.json_codec = json_codec
+        self.transport = transport
+        self.clients = {}
+        self._sessions = {}
+        self._hosts = {}
+        self._pool_connections = {}
+
+        for name, tenant in (tenants or {}).items():
+            self.add(name, **tenant)
+
+    def add(self, name: str, api_url: str, api_token: str, rate_limit: float = None, transport=None):
+        """Add a tenant to the pool.
+
+        Args:
+            name (str): Tenant name, used to tag results.
+            api_url (str): The tenant's API URL.
+            api_token (str): The tenant's API token.
+            rate_limit (float, optional): Requests per second for this tenant. Defaults to the pool's `rate_limit`.
+            transport (object, optional): Transport for this tenant. Defaults to the pool's `transport`,
+                or the session shared by the tenant's region.
+
+        Returns:
+            Kandji
+        """
+        client = Kandji(
+            api_url,
+            api_token,
+            json_codec=self.json_codec,
+            transport=transport or self.transport or self._session(api_url),
+            rate_limiter=RateLimiter(rate_limit or self.rate_limit),
+        )
+        self.clients[name] = client
+        return client
+
+    def _session(self, api_url):
+        # SubDomain.clients.us-1.kandji.io -> clients.us-1.kandji.io
+        host = urlparse(api_url).netloc
+        region = host.partition(".")[2]
+
+        if region not in self._sessions:
+            self._sessions[region] = requests.Session()
+
+        hosts = self._hosts.setdefault(region, set())
+        hosts.add(host)
+        if len(hosts) > self._pool_connections.get(region, 0):
+            # urllib3 keeps one pool per tenant host, grow the cache before it would evict live pools
+            self._pool_connections[region] = max(10, 2 * len(hosts))
+            adapter = HTTPAdapter(pool_connections=self._pool_connections[region], pool_maxsize=self.pool_maxsize)
+            self._sessions[region].mount("https://", adapter)
+
+        return self._sessions[region]
+
+    def map(self, method: str, *args, **kwargs):
+        """Call a `Kandji` method on every tenant concurrently.
+
+        Args:
+            method (str): Name of the `Kandji` method, e.g. `list_blueprints`.
+            *args: Positional arguments passed to the method.
+            **kwargs: Keyword arguments passed to the method.
+
+        Returns:
+            dict: Mapping of tenant name to the method's return value.
+        """
+        return dict(
+            fan_out(
+                lambda name: getattr(self.clients[name], method)(*args, **kwargs),
+                list(self.clients),
+                max_workers=self.max_workers,
+            )
+        )
+
+    def stream(self, method: str, *args, **kwargs):
+        """Run a paginated iterator on every tenant concurrently and merge the records.
+
+        Args:
+            method (str): Name of the `Kandji` iterator method, e.g. `iter_devices`.
+            *args: Positional arguments passed to the method.
+            **kwargs: Keyword arguments passed to the method.
+
+        Yields:
+            tuple: `(tenant name, record)` pairs in arrival order.
+        """
+        iterators = {
+            name: (lambda client=client: getattr(client, method)(*args, **kwargs))
+            for name, client in self.clients.items()
+        }
+        return merge_iterators(iterators)
+
+    def close(self):
+        """Close the shared sessions."""
+        for session in self._sessions.values():
+            session.close()
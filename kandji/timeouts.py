@@ -0,0 +1,74 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+_deadline = contextvars.ContextVar("kandji_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the time budget of the enclosing `deadline` has run out."""
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Bound the total time of every `Kandji` request made inside the block.
+
+    The remaining budget caps the connect and read timeout of each request, including
+    requests made by paginated iterators and by concurrent fan-out in worker threads.
+    Response bodies are streamed and the budget is checked between chunks, so a slowly
+    trickling response is cut off too. Once the budget runs out, requests raise
+    `DeadlineExceeded` instead of being sent and outstanding fan-out work is cancelled.
+    Nested deadlines can only shorten the budget, never extend it.
+
+    A single blocked socket operation is only interrupted by its own timeout, so a call
+    can overrun the deadline by at most the budget that was left when it started.
+
+    Args:
+        seconds (float): Time budget in seconds.
+
+    Raises:
+        DeadlineExceeded: From any request made after the budget has run out.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Return the seconds left in the enclosing `deadline`.
+
+    Returns:
+        float: Seconds left (negative once expired), or `None` outside a deadline.
+    """
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def check():
+    """Raise `DeadlineExceeded` if the enclosing `deadline` has run out.
+
+    Returns:
+        float: Seconds left, or `None` outside a deadline.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Kandji deadline exceeded")
+    return left
+
+
+def cap(timeout, left):
+    """Cap a `requests` timeout (seconds or a `(connect, read)` tuple) to the seconds left."""
+    if left is None:
+        return timeout
+
+    if timeout is None:
+        return left
+
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+
+    return min(timeout, left)
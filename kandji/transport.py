@@ -0,0 +1,168 @@
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+
+class ReplayError(LookupError):
+    """Raised by `ReplayTransport` for a request that is not in the archive."""
+
+
+class Response:
+    """Minimal in-memory stand-in for `requests.Response`, as served by `ReplayTransport`.
+
+    Attributes:
+        status_code (int): HTTP status code.
+        headers (dict): Response headers.
+        content (bytes): Response body.
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self, status_code: int, headers: dict, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            end = start + chunk_size
+            yield self.content[start:end]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _key(method, url, params=None, data=None):
+    params = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+    body = hashlib.blake2b(data if isinstance(data, bytes) else repr(data).encode(), digest_size=16).hexdigest()
+    return json.dumps([method.lower(), url, params, body])
+
+
+class RecordingTransport:
+    """Transport that sends requests through another transport and records them.
+
+    Every request/response pair is appended to a gzip compressed JSON lines archive
+    that `ReplayTransport` can serve back. Request headers, including the API token,
+    are never recorded. Response bodies are stored as-is unless excluded or redacted,
+    so treat archives as sensitive.
+
+    Attributes:
+        path (str): Archive path. Existing archives are appended to.
+        transport (object, optional): Transport used to send the requests.
+            Defaults to a new `requests.Session`.
+        exclude (tuple, optional): URL substrings of requests that are sent but not recorded.
+            Defaults to `("/secrets/",)`, so FileVault keys, Activation Lock bypass codes
+            and unlock PINs never reach the archive.
+        redact (callable, optional): `redact(url, content) -> bytes` applied to every
+            recorded response body.
+    """
+
+    def __init__(self, path: str, transport=None, exclude: tuple = ("/secrets/",), redact=None):
+        if transport is None:
+            import requests
+
+            transport = requests.Session()
+
+        self.path = path
+        self.transport = transport
+        self.exclude = tuple(exclude)
+        self.redact = redact
+        self._archive = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def request(self, method, url, params=None, data=None, stream=False, **kwargs):
+        response = self.transport.request(method, url, params=params, data=data, **kwargs)
+        recorded = Response(
+            response.status_code,
+            {"Content-Type": response.headers.get("Content-Type", "")},
+            response.content,
+        )
+        response.close()
+
+        if any(pattern in url for pattern in self.exclude):
+            return recorded
+
+        content = self.redact(url, recorded.content) if self.redact else recorded.content
+        line = json.dumps(
+            {
+                "key": _key(method, url, params, data),
+                "status": recorded.status_code,
+                "headers": recorded.headers,
+                "body": base64.b64encode(content).decode("ascii"),
+            }
+        )
+        with self._lock:
+            self._archive.write(line + "\n")
+
+        return recorded
+
+    def close(self):
+        """Flush and close the archive."""
+        with self._lock:
+            self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ReplayTransport:
+    """Transport that serves responses from an archive written by `RecordingTransport`.
+
+    Repeated requests are answered in recording order; once exhausted, the last
+    recorded response keeps being served.
+
+    Attributes:
+        path (str): Archive path.
+        latency (float, optional): Seconds to sleep before every response, to simulate
+            network latency. Defaults to 0.
+    """
+
+    def __init__(self, path: str, latency: float = 0):
+        self.path = path
+        self.latency = latency
+        self._responses = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                record = json.loads(line)
+                self._responses[record["key"]].append(
+                    (record["status"], record["headers"], base64.b64decode(record["body"]))
+                )
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        key = _key(method, url, params, data)
+
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise ReplayError(f"No recorded response for {method.upper()} {url}")
+            status, headers, content = responses.popleft() if len(responses) > 1 else responses[0]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        return Response(status, dict(headers), content)
+
+    def close(self):
+        pass
@@ -1,17 +1,84 @@
+import json
 import os
 import pytest
 
 from kandji import Kandji
+from kandji.transport import RecordingTransport, ReplayTransport, Response
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+class FakeTransport:
+    """Transport serving canned JSON responses, for tests that run without a tenant.
+
+    Attributes:
+        body (optional): Response body: bytes, a JSON serializable object or a callable
+            `body(url, params)` returning either. Defaults to an empty list.
+        devices (int, optional): Serve this many devices, `"00"`, `"01"`, ..., from `/devices`
+            with offset pagination, and `{"device_id": ...}` from every device subresource.
+        status_code (int, optional): Status code of every response. Defaults to 200.
+        errors (dict, optional): URL suffix to the status code of the requests failing with it.
+
+    Every request is appended to `requests`.
+    """
+
+    def __init__(self, body=b"[]", devices: int = None, status_code: int = 200, errors: dict = None):
+        self.body = body
+        self.devices = devices
+        self.status_code = status_code
+        self.errors = errors or {}
+        self.requests = []
+
+    def request(self, method, url, params=None, stream=False, **kwargs):
+        params = params or {}
+        self.requests.append({"method": method, "url": url, "params": params, "stream": stream})
+
+        for suffix, status_code in self.errors.items():
+            if url.endswith(suffix):
+                return Response(status_code, {"Content-Type": "application/json"}, b"")
+
+        path = url.split("/api/v1/", 1)[-1].split("/")
+        if self.devices is not None and path == ["devices"]:
+            offset, limit = params.get("offset", 0), params.get("limit", 300)
+            body = [{"device_id": f"{i:02d}"} for i in range(offset, min(offset + limit, self.devices))]
+        elif self.devices is not None and path[0] == "devices":
+            body = {"device_id": path[1]}
+        else:
+            body = self.body(url, params) if callable(self.body) else self.body
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        return Response(self.status_code, {"Content-Type": "application/json"}, body)
+
+
+@pytest.fixture
+def fake_transport():
+    """The `FakeTransport` class, picklable for worker processes."""
+    return FakeTransport
+
+
+@pytest.fixture(scope="session")
+def transport():
+    """Replay API traffic from `KANDJI_REPLAY`, or record it to `KANDJI_RECORD`.
+
+    Without either, tests run against the live tenant.
+    """
+    if os.getenv("KANDJI_REPLAY"):
+        yield ReplayTransport(os.getenv("KANDJI_REPLAY"), latency=float(os.getenv("KANDJI_REPLAY_LATENCY", 0)))
+    elif os.getenv("KANDJI_RECORD"):
+        with RecordingTransport(os.getenv("KANDJI_RECORD")) as recording:
+            yield recording
+    else:
+        yield None
+
+
 @pytest.fixture
-def client():
+def client(transport):
     return Kandji(
         api_url=os.getenv("API_URL"),
         api_token=os.getenv("API_TOKEN"),
+        transport=transport,
     )
 
 
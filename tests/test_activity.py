@@ -0,0 +1,63 @@
+from kandji.activity import ActivityTailer
+
+
+class FakeClient:
+    def __init__(self):
+        self.devices = {}
+        self.activity = {}
+
+    def iter_devices(self, ordering=None):
+        for device_id, last_check_in in sorted(self.devices.items(), key=lambda item: item[1], reverse=True):
+            yield {"device_id": device_id, "last_check_in": last_check_in}
+
+    def get_device_activity(self, id, limit=None, offset=None):
+        results = sorted(self.activity.get(id, []), key=lambda entry: entry["created_at"], reverse=True)
+        end = offset + limit
+        page = results[offset:end]
+        return {"device_id": id, "activity": {"results": page, "next": offset + limit < len(results) or None}}
+
+
+def test_activity_tailer():
+    client = FakeClient()
+    client.devices = {"a": "2024-01-01T00:00:00", "b": "2024-01-01T00:00:01"}
+    client.activity = {"a": [{"id": 1, "created_at": "2024-01-01T00:00:00"}]}
+
+    tailer = ActivityTailer(client, page_size=2)
+    assert list(tailer.poll()) == []
+
+    client.activity["a"] += [
+        {"id": 2, "created_at": "2024-01-02T00:00:01"},
+        {"id": 3, "created_at": "2024-01-02T00:00:03"},
+    ]
+    client.activity["b"] = [{"id": 4, "created_at": "2024-01-02T00:00:02"}]
+    client.devices = {"a": "2024-01-02T00:00:05", "b": "2024-01-02T00:00:05"}
+    assert [(device_id, entry["id"]) for device_id, entry in tailer.poll()] == [("a", 2), ("b", 4), ("a", 3)]
+    assert list(tailer.poll()) == []
+
+
+def test_activity_tailer_backfill():
+    client = FakeClient()
+    client.devices = {"a": "2024-01-01T00:00:00"}
+    client.activity = {
+        "a": [
+            {"id": 1, "created_at": "2024-01-01T00:00:00"},
+            {"id": 2, "created_at": "2024-01-01T00:00:01"},
+        ]
+    }
+
+    tailer = ActivityTailer(client, backfill=True, page_size=1)
+    assert [entry["id"] for _, entry in tailer.poll()] == [1, 2]
+
+
+def test_activity_tailer_resume():
+    client = FakeClient()
+    client.devices = {"a": "2024-01-01T00:00:00"}
+    client.activity = {"a": [{"id": 1, "created_at": "2024-01-01T00:00:00"}]}
+
+    tailer = ActivityTailer(client)
+    list(tailer.poll())
+
+    client.activity["a"].append({"id": 2, "created_at": "2024-01-02T00:00:00"})
+    client.devices["a"] = "2024-01-02T00:00:00"
+    resumed = ActivityTailer(client, state=tailer.state)
+    assert [entry["id"] for _, entry in resumed.poll()] == [2]
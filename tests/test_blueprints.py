@@ -24,3 +24,9 @@ def test_get_blueprint_templates(client):
     res = client.get_blueprint_templates()
     assert type(res['results']) == list
     assert res != {'response': {'status': 404}}
+
+
+def test_iter_blueprints(client):
+    res = list(client.iter_blueprints(limit=2))
+    assert type(res) == list
+    assert all(blueprint.get('id') for blueprint in res)
@@ -0,0 +1,29 @@
+import json
+import os
+
+from kandji.cli import main
+
+
+def test_cli_missing_credentials(monkeypatch):
+    monkeypatch.delenv("KANDJI_API_URL", raising=False)
+    monkeypatch.delenv("KANDJI_API_TOKEN", raising=False)
+    assert main(["devices", "list"]) == 2
+
+
+def test_cli_streams_ndjson(capsysbinary, fake_transport):
+    args = ["--api-url", "https://example.kandji.io", "--api-token", "token", "devices", "list", "--limit", "2"]
+    assert main(args, transport=fake_transport(devices=3)) == 0
+    assert capsysbinary.readouterr().out == b'{"device_id":"00"}\n{"device_id":"01"}\n{"device_id":"02"}\n'
+
+
+def test_cli_devices_list(capsysbinary, transport):
+    args = ["--api-url", os.getenv("API_URL"), "--api-token", os.getenv("API_TOKEN")]
+    assert main([*args, "devices", "list", "--limit", "2"], transport=transport) == 0
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert all(json.loads(line).get('device_id') for line in lines)
+
+
+def test_cli_devices_get(capsysbinary, transport, device_id):
+    args = ["--api-url", os.getenv("API_URL"), "--api-token", os.getenv("API_TOKEN")]
+    assert main([*args, "devices", "get", device_id], transport=transport) == 0
+    assert json.loads(capsysbinary.readouterr().out)['device_id'] == device_id
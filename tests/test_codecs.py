@@ -0,0 +1,21 @@
+import sys
+
+from kandji import Kandji
+from kandji.codecs import StdlibCodec, default_codec
+
+
+def test_default_codec_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    codec = default_codec()
+    assert isinstance(codec, StdlibCodec)
+    assert codec.loads(codec.dumps({"a": [1, True, None]})) == {"a": [1, True, None]}
+
+
+def test_stdlib_codec_dumps_bytes():
+    assert StdlibCodec.dumps({"a": 1}) == b'{"a":1}'
+
+
+def test_format_params():
+    params = {"flag": True, "other": False, "limit": 300, "name": "mac", "offset": None}
+    assert Kandji._format_params(params) == {"flag": "true", "other": "false", "limit": 300, "name": "mac"}
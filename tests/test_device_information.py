@@ -40,3 +40,14 @@ def test_get_device_note(client, device_id, note_id):
 def test_get_device_note_not_found(client, device_id):
     res = client.get_device_note(device_id=device_id, note_id="noid")
     assert res == {'response': {'status': 500}}
+
+
+def test_iter_devices(client):
+    res = list(client.iter_devices(limit=2))
+    assert type(res) == list
+    assert len(res) == len({device['device_id'] for device in res})
+
+
+def test_get_device_activity_limit(client, device_id):
+    res = client.get_device_activity(id=device_id, limit=1)
+    assert len(res['activity']['results']) <= 1
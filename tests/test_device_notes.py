@@ -0,0 +1,90 @@
+from kandji.notes import NotesIndex
+
+
+def test_notes_index_refresh(client, device_id, note_id):
+    index = NotesIndex(client)
+    assert index.refresh([device_id]) == 1
+    assert (device_id, note_id) in index.notes
+
+
+def test_notes_index_search(client, device_id, note_id):
+    index = NotesIndex(client)
+    index.refresh([device_id])
+    content = index.notes[(device_id, note_id)]['content']
+    assert (device_id, note_id) in index.search(f'"{content}"')
+
+
+def test_notes_index_search_not_found(client, device_id):
+    index = NotesIndex(client)
+    index.refresh([device_id])
+    assert index.search('"no such note content anywhere"') == []
+
+
+class FakeClient:
+    def __init__(self, devices):
+        self.notes = {device_id: [] for device_id in devices}
+        self.calls = []
+
+    def iter_devices(self):
+        for device_id in self.notes:
+            yield {"device_id": device_id, "last_check_in": "2024-01-01T00:00:00"}
+
+    def list_device_notes(self, id):
+        self.calls.append(id)
+        return {"notes": self.notes[id]}
+
+
+def test_notes_index_new_note_on_idle_device():
+    fake = FakeClient([f"d{i}" for i in range(10)])
+    index = NotesIndex(fake, sweep_every=4)
+    assert index.refresh() == 10
+
+    fake.notes["d7"].append({"note_id": "n1", "content": "Ticket INC-1234 battery replaced"})
+    for _ in range(4):
+        index.refresh()
+    assert index.search("INC-1234") == [("d7", "n1")]
+
+
+def test_notes_index_incremental_refresh_is_bounded():
+    fake = FakeClient([f"d{i}" for i in range(10)])
+    index = NotesIndex(fake, sweep_every=4)
+    index.refresh()
+
+    fake.calls.clear()
+    index.refresh()
+    assert len(fake.calls) <= 3
+
+    fake.notes["new"] = [{"note_id": "n2", "content": "new device"}]
+    fake.calls.clear()
+    index.refresh()
+    assert "new" in fake.calls
+    assert index.search("new device") == [("new", "n2")]
+
+
+def test_notes_index_drops_removed_devices():
+    fake = FakeClient(["a", "b"])
+    fake.notes["a"].append({"note_id": "n1", "content": "loaner"})
+    index = NotesIndex(fake)
+    index.refresh()
+
+    del fake.notes["a"]
+    index.refresh()
+    assert index.search("loaner") == []
+
+
+def test_notes_index_sweep_survives_fleet_changes():
+    fake = FakeClient([f"d{i}" for i in range(20)])
+    index = NotesIndex(fake, sweep_every=4)
+    index.refresh()
+    last_fetched = dict.fromkeys(fake.notes, 0)
+
+    for refresh in range(1, 13):
+        if refresh == 2:
+            fake.notes["d00"] = []
+        if refresh == 3:
+            del fake.notes["d3"]
+            del last_fetched["d3"]
+        fake.calls.clear()
+        index.refresh()
+        last_fetched.update(dict.fromkeys(fake.calls, refresh))
+        assert all(refresh - fetched < 4 for fetched in last_fetched.values())
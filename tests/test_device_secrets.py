@@ -1,3 +1,11 @@
+import os
+
+import pytest
+
+# Secrets are never recorded, see kandji.transport.RecordingTransport
+pytestmark = pytest.mark.skipif(bool(os.getenv("KANDJI_REPLAY")), reason="secrets are not recorded")
+
+
 def test_get_device_bypasscode(client, device_id):
     res = client.get_device_bypasscode(id=device_id)
     assert type(res) == dict
@@ -0,0 +1,94 @@
+import json
+
+from kandji.codecs import StdlibCodec
+from kandji.drift import Change, Snapshot, _hash, diff
+
+
+def snapshot(devices, apps):
+    hashes, blobs = {}, {}
+    for device_id, device in devices.items():
+        body = json.dumps({"device_id": device_id, "apps": apps.get(device_id, [])}).encode()
+        hashes[device_id] = {"device": _hash(json.dumps(device).encode()), "apps": _hash(body)}
+        blobs[_hash(body)] = body
+    return Snapshot(devices, hashes, blobs)
+
+
+def test_diff_unchanged():
+    old = snapshot({"1": {"os_version": "14.0"}}, {"1": [{"bundle_id": "a", "version": "1"}]})
+    new = snapshot({"1": {"os_version": "14.0"}}, {"1": [{"bundle_id": "a", "version": "1"}]})
+    assert list(diff(old, new, json_codec=StdlibCodec())) == []
+
+
+def test_diff_devices_added_removed():
+    old = snapshot({"1": {}}, {})
+    new = snapshot({"2": {}}, {})
+    assert list(diff(old, new)) == [Change("device_removed", "1", old={}), Change("device_added", "2", new={})]
+
+
+def test_diff_device_fields():
+    old = snapshot({"1": {"os_version": "14.0", "blueprint_id": "a"}}, {})
+    new = snapshot({"1": {"os_version": "14.1", "blueprint_id": "a"}}, {})
+    assert list(diff(old, new)) == [Change("os_version_changed", "1", "os_version", "14.0", "14.1")]
+
+
+def test_diff_apps():
+    old = snapshot({"1": {}}, {"1": [{"bundle_id": "a", "version": "1"}, {"bundle_id": "b"}]})
+    new = snapshot({"1": {}}, {"1": [{"bundle_id": "a", "version": "2"}, {"bundle_id": "c"}]})
+    assert [(change.kind, change.key) for change in diff(old, new)] == [
+        ("app_removed", "b"),
+        ("app_added", "c"),
+        ("app_version_changed", "a"),
+    ]
+
+
+def test_snapshot_save_load(tmp_path):
+    old = snapshot({"1": {}}, {"1": [{"bundle_id": "a", "version": "1"}]})
+    old.save(str(tmp_path))
+    loaded = Snapshot.load(str(tmp_path))
+    assert loaded.hashes == old.hashes
+    assert list(diff(loaded, old)) == []
+
+
+class FakeClient:
+    json_codec = StdlibCodec()
+
+    def __init__(self, devices, apps):
+        self.devices = devices
+        self.apps = apps
+        self.fetched = []
+
+    def iter_devices(self):
+        return iter(self.devices)
+
+    def raw(self):
+        return self
+
+    def get_device_apps(self, id):
+        self.fetched.append(id)
+        return json.dumps({"device_id": id, "apps": self.apps[id]}).encode()
+
+
+def test_capture_reuses_unchanged_bodies_by_hash(tmp_path, monkeypatch):
+    client = FakeClient(
+        [{"device_id": "1", "last_check_in": "t1"}, {"device_id": "2", "last_check_in": "t1"}],
+        {"1": [{"bundle_id": "a", "version": "1"}], "2": [{"bundle_id": "b", "version": "1"}]},
+    )
+    Snapshot.capture(client).save(str(tmp_path / "old"))
+    old = Snapshot.load(str(tmp_path / "old"))
+
+    reads = []
+    monkeypatch.setattr(type(old.blobs), "__getitem__", lambda self, digest: reads.append(digest))
+
+    client.devices[1] = {"device_id": "2", "last_check_in": "t2"}
+    client.apps["2"] = [{"bundle_id": "b", "version": "2"}]
+    client.fetched.clear()
+    new = Snapshot.capture(client, previous=old)
+    assert client.fetched == ["2"]
+    assert new.blobs.keys() == {new.hashes["2"]["apps"]}
+
+    new.save(str(tmp_path / "new"))
+    assert reads == []
+    monkeypatch.undo()
+
+    assert Snapshot.load(str(tmp_path / "new")).hashes == new.hashes
+    assert [(change.kind, change.key) for change in diff(old, new)] == [("app_version_changed", "b")]
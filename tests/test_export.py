@@ -0,0 +1,97 @@
+import functools
+import json
+import pickle
+
+import pytest
+
+from kandji.export import _write_shard, export_devices
+from kandji.kandji import KandjiError
+
+
+def read_ids(path):
+    with open(path) as f:
+        return [json.loads(line)["device_id"] for line in f]
+
+
+def write_shard(tmp_path, fake_transport, shard, shards, total=7):
+    path = str(tmp_path / f"shard-{shard}.ndjson")
+    factory = functools.partial(fake_transport, devices=total)
+    result = _write_shard(
+        "https://example.kandji.io", "token", factory, path, shard, shards, 2, (), {}, None, 2
+    )
+    return result, read_ids(path)
+
+
+def test_write_shard_offsets(tmp_path, fake_transport):
+    assert write_shard(tmp_path, fake_transport, 0, 3)[1] == ["00", "01", "06"]
+    assert write_shard(tmp_path, fake_transport, 1, 3)[1] == ["02", "03"]
+    assert write_shard(tmp_path, fake_transport, 2, 3)[1] == ["04", "05"]
+
+
+def test_write_shard_stops_at_short_page(tmp_path, fake_transport):
+    result, ids = write_shard(tmp_path, fake_transport, 0, 1, total=4)
+    assert ids == ["00", "01", "02", "03"]
+    assert result["pages"] == [2, 2, 0]
+    assert result["records"] == 4
+
+
+def test_write_shard_subresources_and_transform(tmp_path, fake_transport):
+    path = str(tmp_path / "shard.ndjson")
+    factory = functools.partial(fake_transport, devices=7)
+    _write_shard("https://example.kandji.io", "token", factory, path, 0, 1, 2, ("details",), {}, drop_odd, 2)
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["device_id"] for record in records] == ["00", "02", "04", "06"]
+    assert all(record["details"] == {"device_id": record["device_id"]} for record in records)
+
+
+def test_write_shard_failed_subresources(tmp_path, fake_transport):
+    path = str(tmp_path / "shard.ndjson")
+    factory = functools.partial(fake_transport, devices=3, errors={"/apps": 503})
+    result = _write_shard(
+        "https://example.kandji.io", "token", factory, path, 0, 1, 2, ("details", "apps"), {}, None, 2
+    )
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [sorted(record) for record in records] == [["details", "device_id"]] * 3
+    assert sorted(result["failed"]) == [["00", "apps"], ["01", "apps"], ["02", "apps"]]
+
+
+def test_export_devices_list_failure(tmp_path, fake_transport):
+    with pytest.raises(KandjiError):
+        export_devices(
+            "https://example.kandji.io",
+            "token",
+            str(tmp_path),
+            shards=2,
+            limit=2,
+            transport_factory=functools.partial(fake_transport, devices=7, errors={"/devices": 503}),
+        )
+
+
+def drop_odd(device):
+    return None if int(device["device_id"]) % 2 else device
+
+
+def test_export_devices_manifest_and_merge(tmp_path, fake_transport):
+    manifest = export_devices(
+        "https://example.kandji.io",
+        "token",
+        str(tmp_path),
+        shards=3,
+        limit=2,
+        merge=True,
+        transport_factory=functools.partial(fake_transport, devices=7),
+    )
+    assert manifest["records"] == 7
+    assert [shard["records"] for shard in manifest["shards"]] == [3, 2, 2]
+    assert manifest["failed"] == []
+    assert read_ids(manifest["merged"]) == [f"{i:02d}" for i in range(7)]
+    with open(tmp_path / "manifest.json") as f:
+        assert json.load(f)["records"] == 7
+
+
+def test_kandji_error_pickles():
+    error = pickle.loads(pickle.dumps(KandjiError(500)))
+    assert error.status == 500
+    assert str(error) == "Kandji API request failed with status 500"
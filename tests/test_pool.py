@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from kandji import KandjiPool, RateLimiter
+from kandji._concurrency import merge_iterators
+
+TENANTS = {
+    "eu-a": {"api_url": "https://a.clients.eu.kandji.io", "api_token": "a"},
+    "eu-b": {"api_url": "https://b.clients.eu.kandji.io", "api_token": "b"},
+    "us": {"api_url": "https://s.clients.us-1.kandji.io", "api_token": "c"},
+}
+
+
+@pytest.fixture
+def pool(fake_transport):
+    # One transport per tenant, so results can only be tagged with the right tenant
+    pool = KandjiPool(rate_limit=1000)
+    for devices, (name, tenant) in enumerate(TENANTS.items(), 3):
+        pool.add(name, **tenant, transport=fake_transport(devices=devices))
+    return pool
+
+
+def test_rate_limiter_pacing():
+    limiter = RateLimiter(50, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_rate_limiter_burst():
+    limiter = RateLimiter(1, burst=5)
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.5
+
+
+def test_rate_limiter_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_pool_shares_session_per_region():
+    pool = KandjiPool(TENANTS)
+    assert pool.clients["eu-a"].transport is pool.clients["eu-b"].transport
+    assert pool.clients["eu-a"].transport is not pool.clients["us"].transport
+    assert pool.clients["eu-a"].rate_limiter is not pool.clients["eu-b"].rate_limiter
+
+
+def test_pool_keeps_a_connection_pool_per_tenant():
+    tenants = {str(i): {"api_url": f"https://t{i}.clients.eu.kandji.io", "api_token": "t"} for i in range(30)}
+    session = KandjiPool(tenants).clients["0"].transport
+    assert session.get_adapter("https://t0.clients.eu.kandji.io")._pool_connections >= 30
+
+
+def test_pool_map(pool):
+    res = pool.map("list_devices")
+    assert {name: len(devices) for name, devices in res.items()} == {"eu-a": 3, "eu-b": 4, "us": 5}
+
+
+def test_pool_stream(pool):
+    records = sorted((tenant, device["device_id"]) for tenant, device in pool.stream("iter_devices", limit=2))
+    expected = {"eu-a": 3, "eu-b": 4, "us": 5}
+    assert records == sorted((name, f"{i:02d}") for name, total in expected.items() for i in range(total))
+
+
+def test_merge_iterators_producers_exit_after_close():
+    gen = merge_iterators({"a": iter([1, 2])}, max_buffered=1)
+    assert next(gen) == ("a", 1)
+    # Let the producer fill the queue again and finish its iterator
+    time.sleep(0.2)
+    threads = [thread for thread in threading.enumerate() if thread.daemon]
+    gen.close()
+    time.sleep(0.5)
+    assert not [thread for thread in threads if thread.is_alive()]
@@ -0,0 +1,40 @@
+import io
+
+from kandji import Kandji
+
+BODY = b'[{"device_id": "a"}]'
+
+
+def test_raw_bytes(fake_transport):
+    client = Kandji("https://example.kandji.io", "token", transport=fake_transport(BODY))
+    assert client.raw().list_devices() == BODY
+    assert client.list_devices() == [{"device_id": "a"}]
+
+
+def test_raw_view(fake_transport):
+    res = Kandji("https://example.kandji.io", "token", transport=fake_transport(BODY)).raw(view=True).list_devices()
+    assert isinstance(res, memoryview)
+    assert res.tobytes() == BODY
+
+
+def test_raw_out(fake_transport):
+    transport = fake_transport(BODY)
+    out = io.BytesIO()
+    client = Kandji("https://example.kandji.io", "token", transport=transport)
+    assert client.raw(out=out, chunk_size=4).list_devices() == len(BODY)
+    assert out.getvalue() == BODY
+    assert [request["stream"] for request in transport.requests] == [True]
+
+
+def test_raw_error_response(fake_transport):
+    transport = fake_transport(status_code=404)
+    out = io.BytesIO()
+    client = Kandji("https://example.kandji.io", "token", transport=transport)
+    assert client.raw().get_device("noid") == {"response": {"status": 404}}
+    assert client.raw(out=out).get_device("noid") == {"response": {"status": 404}}
+    assert out.getvalue() == b""
+
+
+def test_raw_only_applies_to_get(fake_transport):
+    client = Kandji("https://example.kandji.io", "token", transport=fake_transport({"id": "x"}))
+    assert client.raw().upload_custom_app("app.pkg") == {"id": "x"}
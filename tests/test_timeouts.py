@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from kandji import Kandji
+from kandji.kandji import DEFAULT_TIMEOUT
+from kandji.transport import Response
+from kandji.timeouts import DeadlineExceeded, cap, check, deadline, remaining
+
+
+def test_remaining_outside_deadline():
+    assert remaining() is None
+    assert check() is None
+
+
+def test_nested_deadline_only_shortens():
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        assert 1 < remaining() <= 10
+    assert remaining() is None
+
+
+def test_deadline_exceeded():
+    with deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            check()
+
+
+def test_deadline_exceeded_request(client):
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            client.list_devices()
+
+
+def test_cap():
+    assert cap(None, None) is None
+    assert cap((3, 30), None) == (3, 30)
+    assert cap(None, 5) == 5
+    assert cap(10, 5) == 5
+    assert cap((3, 30), 5) == (3, 5)
+    assert cap((None, 30), 5) == (5, 5)
+
+
+class TrickleTransport:
+    def __init__(self, chunks=10, delay=0.03):
+        self.chunks = chunks
+        self.delay = delay
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append(kwargs)
+        return TrickleResponse(self.chunks, self.delay)
+
+
+class TrickleResponse(Response):
+    def __init__(self, chunks, delay):
+        super().__init__(200, {"Content-Type": "application/json"}, b"[" + b"1," * (chunks - 1) + b"1]")
+        self.delay = delay
+
+    def iter_content(self, chunk_size=1):
+        for chunk in super().iter_content(2):
+            time.sleep(self.delay)
+            yield chunk
+
+
+def test_default_timeout():
+    transport = TrickleTransport(delay=0)
+    Kandji("https://example.kandji.io", "token", transport=transport).list_devices()
+    assert transport.requests[0]["timeout"] == DEFAULT_TIMEOUT
+    assert transport.requests[0]["stream"] is False
+
+
+def test_deadline_bounds_body_read():
+    transport = TrickleTransport(chunks=20)
+    client = Kandji("https://example.kandji.io", "token", transport=transport)
+    started = time.monotonic()
+    with deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            client.list_devices()
+    assert time.monotonic() - started < 0.3
+    assert transport.requests[0]["stream"] is True
+
+
+def test_deadline_body_read_within_budget():
+    client = Kandji("https://example.kandji.io", "token", transport=TrickleTransport(chunks=3, delay=0))
+    with deadline(5):
+        assert client.list_devices() == [1, 1, 1]
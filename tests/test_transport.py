@@ -0,0 +1,67 @@
+import itertools
+
+import pytest
+
+from kandji import Kandji
+from kandji.transport import RecordingTransport, ReplayError, ReplayTransport
+
+
+@pytest.fixture
+def counting_transport(fake_transport):
+    # Every response differs, so replay order can be checked
+    calls = itertools.count(1)
+    return fake_transport(lambda url, params: [{"device_id": str(next(calls))}])
+
+
+def test_record_replay(tmp_path, counting_transport):
+    archive = str(tmp_path / "archive.jsonl.gz")
+    with RecordingTransport(archive, counting_transport) as recording:
+        client = Kandji("https://example.kandji.io", "token", transport=recording)
+        first, second = client.get_device("a"), client.get_device("a")
+
+    client = Kandji("https://example.kandji.io", "other-token", transport=ReplayTransport(archive))
+    assert client.get_device("a") == first
+    assert client.get_device("a") == second
+    assert client.get_device("a") == second
+    assert client.raw().get_device("a") == b'[{"device_id": "2"}]'
+
+
+def test_replay_missing(tmp_path, counting_transport):
+    archive = str(tmp_path / "archive.jsonl.gz")
+    with RecordingTransport(archive, counting_transport) as recording:
+        Kandji("https://example.kandji.io", "token", transport=recording).get_device("a")
+
+    client = Kandji("https://example.kandji.io", "token", transport=ReplayTransport(archive))
+    with pytest.raises(ReplayError):
+        client.get_device("b")
+
+
+def test_recording_excludes_token(tmp_path, counting_transport):
+    archive = tmp_path / "archive.jsonl.gz"
+    with RecordingTransport(str(archive), counting_transport) as recording:
+        Kandji("https://example.kandji.io", "secret-token", transport=recording).get_device("a")
+
+    assert b"secret-token" not in archive.read_bytes()
+
+
+def test_recording_excludes_secrets(tmp_path, counting_transport):
+    archive = str(tmp_path / "archive.jsonl.gz")
+    with RecordingTransport(archive, counting_transport) as recording:
+        client = Kandji("https://example.kandji.io", "token", transport=recording)
+        assert client.get_device_filevaultkey("a") == [{"device_id": "1"}]
+        client.get_device("a")
+
+    client = Kandji("https://example.kandji.io", "token", transport=ReplayTransport(archive))
+    assert client.get_device("a") == [{"device_id": "2"}]
+    with pytest.raises(ReplayError):
+        client.get_device_filevaultkey("a")
+
+
+def test_recording_redact(tmp_path, counting_transport):
+    archive = str(tmp_path / "archive.jsonl.gz")
+    redact = lambda url, content: content.replace(b'"1"', b'"redacted"')  # noqa: E731
+    with RecordingTransport(archive, counting_transport, redact=redact) as recording:
+        assert Kandji("https://example.kandji.io", "token", transport=recording).get_device("a") == [{"device_id": "1"}]
+
+    client = Kandji("https://example.kandji.io", "token", transport=ReplayTransport(archive))
+    assert client.get_device("a") == [{"device_id": "redacted"}]